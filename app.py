@@ -4,12 +4,17 @@ Main Flask application entry point.
 Initializes the application, database, authentication, and routes.
 """
 
+import os
+import threading
+
 from flask import Flask, render_template
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect, generate_csrf
 from routes.auth_routes import auth_bp
 from routes.patient_routes import patient_bp
 from models.auth_model import init_auth_db, User
+from models.patient_model import init_patient_db
+from utils.model_predictor import warm_predictor
 from config import Config
 
 def create_app():
@@ -25,16 +30,27 @@ def create_app():
     # Initialize CSRF protection for form security
     csrf = CSRFProtect(app)
     
-    # Make CSRF token available in all templates
+    # Make CSRF token available in all templates. The same dict is returned
+    # for every render; the token itself is only generated when a template
+    # calls csrf_token(), and generate_csrf() caches it on g for the rest
+    # of the request.
+    csrf_context = dict(csrf_token=generate_csrf)
+
     @app.context_processor
     def inject_csrf_token():
-        def csrf_token():
-            return generate_csrf()
-        return dict(csrf_token=csrf_token)
+        return csrf_context
 
     # Initialize authentication database
     init_auth_db()
 
+    # Ensure patient collection indexes exist (skipped if MongoDB is down).
+    # Runs in the background so an unreachable server doesn't delay startup.
+    threading.Thread(target=init_patient_db, daemon=True).start()
+
+    # Load the prediction model in the background so the server starts
+    # accepting requests immediately and the first /predict is still fast
+    threading.Thread(target=warm_predictor, daemon=True).start()
+
     # Configure Flask-Login
     login_manager = LoginManager()
     login_manager.init_app(app)
@@ -69,5 +85,6 @@ def create_app():
     return app
 
 if __name__ == "__main__":
+    # Development server only; production runs wsgi:application under Gunicorn
     app = create_app()
-    app.run(debug=True)
+    app.run(debug=os.environ.get("FLASK_ENV") == "development")
@@ -18,6 +18,12 @@ class Config:
     # MongoDB connection URI for patient records
     MONGO_URI = os.environ.get('MONGO_URI') or "mongodb://localhost:27017/stroke_db"
     
+    # MongoDB connection pool tuning
+    MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 50))
+    MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 5))
+    # Wire compression; zstd/snappy need their optional Python packages installed
+    MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS') or "zlib"
+    
     # SQLite database path for user authentication
     SQLALCHEMY_DB = "instance/auth.db"
     
@@ -6,40 +6,209 @@ Handles user creation, authentication, and password hashing.
 
 import sqlite3
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 
 DEFAULT_DB_PATH = os.path.join("instance", "auth.db")
 os.makedirs(os.path.dirname(DEFAULT_DB_PATH), exist_ok=True)
 DB_PATH = DEFAULT_DB_PATH
+
+# Pin the hashing method so every Werkzeug version uses the OpenSSL-backed
+# scrypt KDF; hashes made with any other method are upgraded on next login.
+PASSWORD_HASH_METHOD = "scrypt:32768:8:1"
+
+# Canonical SQL text. sqlite3 caches prepared statements per connection keyed
+# on the exact string, so every caller reuses these to hit that cache.
+STATEMENT_CACHE_SIZE = 128
+_SQL_SELECT_BY_USERNAME = "SELECT id,username,password FROM users WHERE username=?"
+_SQL_SELECT_BY_ID = "SELECT id,username,password FROM users WHERE id=?"
+_SQL_INSERT_USER = "INSERT OR IGNORE INTO users(username,password) VALUES(?,?)"
+_SQL_UPDATE_PASSWORD = "UPDATE users SET password=? WHERE id=?"
+
+# Idle connections kept open between requests; extra connections opened
+# under load are closed on return instead of growing the pool.
+POOL_SIZE = 8
+_pool = queue.Queue(maxsize=POOL_SIZE)
+
+
+class _PooledConnection(sqlite3.Connection):
+    """
+    SQLite connection that remembers which database file it was opened on,
+    so connections to a previous DB_PATH are never handed out again.
+    """
+
+    db_path = None
+
+
+def _connect():
+    """
+    Open a new connection to DB_PATH and apply the per-connection PRAGMAs.
+    """
+    conn = sqlite3.connect(
+        DB_PATH,
+        uri=DB_PATH.startswith("file:"),
+        check_same_thread=False,
+        factory=_PooledConnection,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.db_path = DB_PATH
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def _get_conn():
+    """
+    Take an idle connection from the pool, opening a new one if none is free.
+    """
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            return _connect()
+        if conn.db_path == DB_PATH:
+            return conn
+        conn.close()
+
+
+def _return_conn(conn):
+    """
+    Give a connection back to the pool, closing it if the pool is full
+    or the database path has changed since it was opened.
+    """
+    if conn.db_path != DB_PATH:
+        conn.close()
+        return
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+def _drain_pool():
+    """
+    Close every idle connection currently held by the pool.
+    """
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            return
+        conn.close()
+
+
+@contextmanager
+def _checkout():
+    """
+    Borrow a pooled connection for the duration of a with-block.
+    Commits on success and rolls back if the block raises.
+    """
+    conn = _get_conn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        _return_conn(conn)
+
+
+# Flask-Login reloads the current user on every request, so recently seen
+# rows are kept in memory as (id, username, password) tuples for a short time.
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 60
+_user_cache = OrderedDict()
+_user_cache_lock = threading.RLock()
+
+
+def _cache_get(uid):
+    """
+    Return the cached user row for uid, or None if missing or expired.
+    """
+    with _user_cache_lock:
+        entry = _user_cache.get(uid)
+        if entry is None:
+            return None
+        expires, row = entry
+        if expires < time.monotonic():
+            del _user_cache[uid]
+            return None
+        _user_cache.move_to_end(uid)
+        return row
+
+
+def _cache_put(uid, row):
+    """
+    Store a user row, evicting the least recently used entry when full.
+    """
+    with _user_cache_lock:
+        _user_cache[uid] = (time.monotonic() + USER_CACHE_TTL, row)
+        _user_cache.move_to_end(uid)
+        while len(_user_cache) > USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
+
+
+def _cache_clear():
+    """
+    Drop every cached user row.
+    """
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
 def set_db_path(path):
     """
     Update the database path used by the authentication model.
+    Closes pooled connections to the previous database.
 
     Args:
-        path: Filesystem path to the SQLite database.
+        path: Filesystem path to the SQLite database, or a "file:" URI such
+            as "file:auth?mode=memory&cache=shared". A shared in-memory
+            database is freed when its last connection closes.
+
+    Raises:
+        ValueError: If path is ":memory:", which would give every pooled
+            connection its own private, empty database
     """
     global DB_PATH
-    directory = os.path.dirname(path)
-    if directory:
-        os.makedirs(directory, exist_ok=True)
+    if path == ":memory:":
+        raise ValueError(
+            'Plain ":memory:" is not shared between pooled connections; '
+            'use a URI such as "file:auth?mode=memory&cache=shared"'
+        )
+    if not path.startswith("file:"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
     DB_PATH = path
+    _drain_pool()
+    _cache_clear()
 
 
 def init_auth_db():
     """
     Initialize the SQLite database for user authentication.
     Creates the users table if it doesn't exist.
+    Uses its own connection rather than the pool, so an app preloaded before
+    forking workers doesn't hand an open SQLite connection to every child.
     """
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""CREATE TABLE IF NOT EXISTS users(
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE,
-        password TEXT
-    )""")
-    conn.commit()
-    conn.close()
+    conn = _connect()
+    try:
+        conn.execute("""CREATE TABLE IF NOT EXISTS users(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE,
+            password TEXT
+        )""")
+        conn.commit()
+    finally:
+        conn.close()
 
 
 class User(UserMixin):
@@ -61,31 +230,42 @@ class User(UserMixin):
         self.username = username
         self.password = password
 
+    @staticmethod
+    def _invalidate(uid):
+        """
+        Remove a user from the get_by_id cache.
+        Call this whenever a user's stored row changes or their session ends.
+
+        Args:
+            uid: User ID to evict
+        """
+        with _user_cache_lock:
+            _user_cache.pop(str(uid), None)
+
     @staticmethod
     def create(username, password):
         """
         Create a new user with hashed password.
+        Uses a single INSERT OR IGNORE so duplicate usernames are detected
+        by the UNIQUE constraint without a separate lookup. Unlike
+        RETURNING, this works on any SQLite version.
         
         Args:
             username: Username for the new user
             password: Plain text password (will be hashed)
             
         Returns:
-            bool: True if user was created successfully, False otherwise
+            int: ID of the new user, or None if the username already exists
         """
-        try:
-            hashed = generate_password_hash(password)
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            c.execute("INSERT INTO users(username,password) VALUES(?,?)", (username, hashed))
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.IntegrityError:
-            # Username already exists
-            return False
-        except Exception:
-            return False
+        hashed = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+        with _checkout() as conn:
+            cursor = conn.execute(_SQL_INSERT_USER, (username, hashed))
+            inserted, uid = cursor.rowcount, cursor.lastrowid
+        # No row inserted means the UNIQUE constraint ignored a duplicate
+        if inserted == 0:
+            return None
+        User._invalidate(uid)
+        return uid
 
     @staticmethod
     def authenticate(username, password):
@@ -100,22 +280,43 @@ class User(UserMixin):
             User object if authentication succeeds, None otherwise
         """
         try:
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            c.execute("SELECT id,username,password FROM users WHERE username=?", (username,))
-            row = c.fetchone()
-            conn.close()
+            with _checkout() as conn:
+                row = conn.execute(_SQL_SELECT_BY_USERNAME, (username,)).fetchone()
             
             if row and check_password_hash(row[2], password):
+                if not row[2].startswith(PASSWORD_HASH_METHOD + "$"):
+                    row = User._rehash(row, password)
                 return User(*row)
             return None
         except Exception:
             return None
 
+    @staticmethod
+    def _rehash(row, password):
+        """
+        Re-hash a legacy password with PASSWORD_HASH_METHOD and store it.
+        
+        Args:
+            row: (id, username, password) tuple with the old hash
+            password: Plain text password that was just verified
+            
+        Returns:
+            tuple: The row with the new hash, or the original row if the update fails
+        """
+        try:
+            hashed = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+            with _checkout() as conn:
+                conn.execute(_SQL_UPDATE_PASSWORD, (hashed, row[0]))
+            User._invalidate(row[0])
+            return (row[0], row[1], hashed)
+        except Exception:
+            return row
+
     @staticmethod
     def get_by_id(uid):
         """
         Retrieve a user by their ID.
+        Recently loaded users are served from an in-memory TTL cache.
         
         Args:
             uid: User ID to look up
@@ -123,13 +324,17 @@ class User(UserMixin):
         Returns:
             User object if found, None otherwise
         """
+        key = str(uid)
+        row = _cache_get(key)
+        if row is not None:
+            return User(*row)
         try:
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            c.execute("SELECT id,username,password FROM users WHERE id=?", (uid,))
-            row = c.fetchone()
-            conn.close()
-            return User(*row) if row else None
+            with _checkout() as conn:
+                row = conn.execute(_SQL_SELECT_BY_ID, (uid,)).fetchone()
+            if row is None:
+                return None
+            _cache_put(key, tuple(row))
+            return User(*row)
         except Exception:
             return None
 
@@ -145,11 +350,9 @@ class User(UserMixin):
             bool: True if username exists, False otherwise
         """
         try:
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            c.execute("SELECT id FROM users WHERE username=?", (username,))
-            result = c.fetchone()
-            conn.close()
+            with _checkout() as conn:
+                # Same text as authenticate() so both share one prepared statement
+                result = conn.execute(_SQL_SELECT_BY_USERNAME, (username,)).fetchone()
             return result is not None
         except Exception:
             return False
@@ -4,37 +4,173 @@ Patient model for managing patient records in MongoDB.
 Handles CRUD operations for patient data.
 """
 
-from pymongo import MongoClient
+from functools import lru_cache
+from pymongo import ASCENDING, InsertOne, MongoClient
 from bson.objectid import ObjectId
 from config import Config
+from utils.validation import OBJECT_ID_RE
+
+
+@lru_cache(maxsize=None)
+def _get_client(uri=Config.MONGO_URI):
+    """
+    Build (once per URI) a MongoClient with an explicitly sized connection pool.
+    
+    Args:
+        uri: MongoDB connection URI
+        
+    Returns:
+        Shared MongoClient instance for that URI
+    """
+    return MongoClient(
+        uri,
+        maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+        minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+        waitQueueTimeoutMS=2000,
+        serverSelectionTimeoutMS=3000,
+        compressors=Config.MONGO_COMPRESSORS,
+        retryReads=True,
+        # Don't open sockets or monitor threads until the first query, so a
+        # preloaded app can fork workers without sharing live connections
+        connect=False,
+    )
+
+
+# Server selection timeout for the one-off index setup client; an unreachable
+# server should not hold up startup for the full query timeout
+INDEX_SETUP_TIMEOUT_MS = 500
 
 # Initialize MongoDB connection
-client = MongoClient(Config.MONGO_URI)
+client = _get_client(Config.MONGO_URI)
 db = client["stroke_db"]
 patients = db["patients"]
 
 
+def init_patient_db():
+    """
+    Create the indexes used by patient lookups if they don't exist.
+    Uses a short-lived client so the shared pool stays unopened at startup.
+    
+    Returns:
+        bool: True if the indexes are in place, False if MongoDB is unreachable
+    """
+    try:
+        with MongoClient(Config.MONGO_URI, serverSelectionTimeoutMS=INDEX_SETUP_TIMEOUT_MS) as setup_client:
+            collection = setup_client[db.name][patients.name]
+            # (name, _id) backs the sorted list pages and also serves name lookups
+            collection.create_index([("name", ASCENDING), ("_id", ASCENDING)])
+            collection.create_index([("age", ASCENDING)])
+        return True
+    except Exception:
+        return False
+
+
 def create_patient(data):
     """
     Create a new patient record in MongoDB.
     
     Args:
-        data: Dictionary containing patient information
+        data: Dictionary containing patient information, or a list of
+            such dictionaries to insert in bulk
         
     Returns:
-        InsertOneResult object with the inserted document ID
+        InsertOneResult object with the inserted document ID, or the list
+        returned by create_patients_bulk when given a list
     """
+    if isinstance(data, list):
+        return create_patients_bulk(data)
     return patients.insert_one(data)
 
 
-def get_all_patients():
+def create_patients_bulk(data_list, chunk=1000):
     """
-    Retrieve all patient records from MongoDB.
+    Insert many patient records using unordered bulk writes.
     
+    Args:
+        data_list: List of dictionaries containing patient information
+        chunk: Maximum number of documents sent per bulk_write call
+        
     Returns:
-        List of patient documents
+        List of BulkWriteResult objects, one per chunk
     """
-    return list(patients.find())
+    results = []
+    for i in range(0, len(data_list), chunk):
+        requests = [InsertOne(doc) for doc in data_list[i:i + chunk]]
+        results.append(patients.bulk_write(requests, ordered=False))
+    return results
+
+
+# Fields shown on the patient list page
+LIST_PROJECTION = {
+    "name": 1,
+    "age": 1,
+    "gender": 1,
+    "hypertension": 1,
+    "avg_glucose_level": 1,
+    "bmi": 1,
+}
+
+
+def get_all_patients(projection=None, limit=None, skip=0):
+    """
+    Retrieve patient records from MongoDB.
+    
+    Args:
+        projection: Fields to return (defaults to LIST_PROJECTION)
+        limit: Maximum number of documents to return (None for all)
+        skip: Number of documents to skip, for pagination
+        
+    Returns:
+        Cursor over the matching patient documents
+    """
+    cursor = patients.find({}, projection or LIST_PROJECTION)
+    if skip:
+        cursor = cursor.skip(skip)
+    if limit:
+        cursor = cursor.limit(limit)
+    return cursor
+
+
+def _to_object_id(pid):
+    """
+    Convert a patient ID to an ObjectId without raising on bad input.
+    
+    Args:
+        pid: Patient ID (ObjectId or ObjectId string)
+        
+    Returns:
+        ObjectId if pid is well-formed, None otherwise
+    """
+    if isinstance(pid, ObjectId):
+        return pid
+    if isinstance(pid, str) and len(pid) == 24 and OBJECT_ID_RE.fullmatch(pid):
+        return ObjectId(pid)
+    return None
+
+
+def list_patients_page(skip, limit, sort_field="name"):
+    """
+    Retrieve one sorted page of patients, with sorting, paging and projection
+    all done by MongoDB.
+    
+    Args:
+        skip: Number of documents to skip
+        limit: Maximum number of documents to return
+        sort_field: Field from LIST_PROJECTION to sort by (ascending)
+        
+    Returns:
+        List of patient documents containing the LIST_PROJECTION fields
+    """
+    if sort_field not in LIST_PROJECTION:
+        raise ValueError(f"Cannot sort patients by {sort_field!r}")
+    pipeline = [
+        # _id breaks ties so pages stay stable when names repeat
+        {"$sort": {sort_field: 1, "_id": 1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": LIST_PROJECTION},
+    ]
+    return list(patients.aggregate(pipeline, allowDiskUse=False))
 
 
 def get_patient(pid):
@@ -47,9 +183,13 @@ def get_patient(pid):
     Returns:
         Patient document if found, None otherwise
     """
+    oid = _to_object_id(pid)
+    if oid is None:
+        return None
     try:
-        return patients.find_one({"_id": ObjectId(pid)})
+        return patients.find_one({"_id": oid})
     except Exception:
+        # Database errors (e.g. MongoDB unreachable)
         return None
 
 
@@ -64,9 +204,13 @@ def update_patient(pid, data):
     Returns:
         UpdateResult object
     """
+    oid = _to_object_id(pid)
+    if oid is None:
+        return None
     try:
-        return patients.update_one({"_id": ObjectId(pid)}, {"$set": data})
+        return patients.update_one({"_id": oid}, {"$set": data})
     except Exception:
+        # Database errors (e.g. MongoDB unreachable)
         return None
 
 
@@ -80,7 +224,11 @@ def delete_patient(pid):
     Returns:
         DeleteResult object
     """
+    oid = _to_object_id(pid)
+    if oid is None:
+        return None
     try:
-        return patients.delete_one({"_id": ObjectId(pid)})
+        return patients.delete_one({"_id": oid})
     except Exception:
+        # Database errors (e.g. MongoDB unreachable)
         return None
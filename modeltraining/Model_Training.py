@@ -89,16 +89,18 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
 from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import classification_report, accuracy_score
+from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
 
 
 # In[15]:
 
 
-X = df1.drop(columns=["stroke"])
+# hypertension passes through unchanged; store it as float32 so it doesn't
+# upcast the float32 design matrix to float64
+X = df1.drop(columns=["stroke"]).astype({"hypertension": np.float32})
 y = df1["stroke"]
 
 # Split the data
@@ -129,13 +131,14 @@ categorical_features = [
 
 numeric_transformer = Pipeline(steps=[
     ("imputer", SimpleImputer(strategy="median")),
-    ("scaler", StandardScaler())
+    ("scaler", StandardScaler()),
+    ("float32", FunctionTransformer(np.asarray, kw_args={"dtype": np.float32}))
 ])
 
 # Categorical transformer (impute most frequent + one hot encoding)
 categorical_transformer = Pipeline(steps=[
     ("imputer", SimpleImputer(strategy="most_frequent")),
-    ("onehot", OneHotEncoder(handle_unknown="ignore"))
+    ("onehot", OneHotEncoder(handle_unknown="ignore", sparse_output=True, dtype=np.float32))
 ])
 
 
@@ -147,22 +150,27 @@ preprocessor = ColumnTransformer(
         ("num", numeric_transformer, numeric_features),
         ("cat", categorical_transformer, categorical_features)
     ],
-    remainder="passthrough"  # This keeps hypertension as it is
+    remainder="passthrough",  # This keeps hypertension as it is
+    # Always return the sparse matrix; the default threshold densifies it
+    sparse_threshold=1.0
 )
 
 
 # In[46]:
 
 
+# saga works directly on the sparse float32 design matrix;
+# memory= caches the fitted preprocessor between repeated fits
 model = Pipeline(steps=[
     ("preprocess", preprocessor),
     ("classifier", LogisticRegression(
         max_iter=2000,
         class_weight="balanced",
         penalty="l1",
-        solver="liblinear"
+        solver="saga",
+        tol=1e-3
     ))
-])
+], memory="./cache")
 
 
 # In[47]:
@@ -191,7 +199,8 @@ print(classification_report(y_test, y_pred))
 
 
 import joblib
-joblib.dump(model, "stroke_model.pkl")
+# Persist the decision threshold alongside the pipeline so inference uses the same cut-off
+joblib.dump({"model": model, "threshold": threshold}, "stroke_model.pkl")
 print("Model saved as stroke_model.pkl")
 
 
@@ -74,17 +74,19 @@ def register():
             flash(password_error, "danger")
             return render_template("register.html")
         
-        # Check if username already exists
-        if User.username_exists(username):
+        # Create user; None means the username is already taken
+        try:
+            user_id = User.create(username, password)
+        except Exception:
+            flash("Error creating account. Please try again.", "danger")
+            return render_template("register.html")
+        
+        if user_id is None:
             flash("Username already exists. Please choose another.", "danger")
             return render_template("register.html")
         
-        # Create user
-        if User.create(username, password):
-            flash("Account created successfully! Please login.", "success")
-            return redirect("/auth/login")
-        else:
-            flash("Error creating account. Please try again.", "danger")
+        flash("Account created successfully! Please login.", "success")
+        return redirect("/auth/login")
     
     return render_template("register.html")
 
@@ -94,6 +96,8 @@ def logout():
     """
     Handle user logout.
     """
+    if current_user.is_authenticated:
+        User._invalidate(current_user.id)
     logout_user()
     flash("You have been logged out successfully.", "info")
     return redirect("/auth/login")
@@ -4,32 +4,76 @@ Patient management routes for CRUD operations.
 Includes input validation and error handling.
 """
 
-from flask import Blueprint, render_template, request, redirect, flash
-from flask_login import login_required
-from models.patient_model import create_patient, get_all_patients, get_patient, update_patient, delete_patient
-from utils.validation import (
-    validate_patient_name, validate_patient_age, validate_object_id,
-    validate_gender, validate_hypertension, validate_ever_married,
-    validate_work_type, validate_residence_type, validate_avg_glucose_level,
-    validate_bmi, validate_smoking_status
-)
+import hashlib
+
+from flask import Blueprint, Response, make_response, render_template, request, redirect, flash, session
+from flask_login import current_user, login_required
+from models.patient_model import create_patient, list_patients_page, get_patient, update_patient, delete_patient
+from utils.validation import validate_object_id, validate_patient_payload
 from utils.model_predictor import get_predictor
 
 patient_bp = Blueprint("patients", __name__, url_prefix="/patients")
 
+# Number of patients shown per page on the list view
+PAGE_SIZE = 50
+
+
+def _list_etag(pts, page, has_next):
+    """
+    Build an ETag for one page of the patient list.
+    
+    Args:
+        pts: Patient documents shown on the page
+        page: Page number
+        has_next: Whether a next page exists
+        
+    Returns:
+        str: Hex digest identifying the rendered content
+    """
+    key = repr((current_user.get_id(), page, has_next, pts))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
 
 @patient_bp.route("/")
 @login_required
 def list_patients():
     """
-    Display list of all patients.
+    Display one page of patients.
     """
+    page = max(request.args.get("page", 1, type=int), 1)
+    offset = (page - 1) * PAGE_SIZE
     try:
-        pts = get_all_patients()
-        return render_template("patients/list.html", patients=pts)
+        # Fetch one extra row to find out whether a next page exists
+        pts = list_patients_page(offset, PAGE_SIZE + 1)
+        has_next = len(pts) > PAGE_SIZE
+        pts = pts[:PAGE_SIZE]
+        
+        # Pending flash messages are part of the page, so only use the
+        # ETag shortcut when there are none
+        etag = None
+        if "_flashes" not in session:
+            etag = _list_etag(pts, page, has_next)
+            # If-None-Match uses weak comparison; proxies that compress the
+            # body (e.g. nginx gzip) hand the tag back as W/"..."
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+        
+        response = make_response(render_template(
+            "patients/list.html",
+            patients=pts,
+            page=page,
+            offset=offset,
+            has_next=has_next,
+        ))
+        if etag:
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+        return response
     except Exception as e:
         flash("Error loading patients. Please try again.", "danger")
-        return render_template("patients/list.html", patients=[])
+        return render_template("patients/list.html", patients=[], page=page, offset=offset, has_next=False)
 
 
 @patient_bp.route("/add", methods=["GET", "POST"])
@@ -39,75 +83,10 @@ def add_patient():
     Add a new patient with input validation.
     """
     if request.method == "POST":
-        # Get and validate all form fields
-        name = request.form.get("name", "").strip()
-        age = request.form.get("age", "").strip()
-        gender = request.form.get("gender", "")
-        hypertension = request.form.get("hypertension", "")
-        ever_married = request.form.get("ever_married", "")
-        work_type = request.form.get("work_type", "")
-        residence_type = request.form.get("residence_type", "")
-        avg_glucose_level = request.form.get("avg_glucose_level", "").strip()
-        bmi = request.form.get("bmi", "").strip()
-        smoking_status = request.form.get("smoking_status", "")
-        
-        # Validate all inputs
-        name_valid, name_error = validate_patient_name(name)
-        age_valid, age_error, age_int = validate_patient_age(age)
-        gender_valid, gender_error = validate_gender(gender)
-        hypertension_valid, hypertension_error, hypertension_int = validate_hypertension(hypertension)
-        ever_married_valid, ever_married_error = validate_ever_married(ever_married)
-        work_type_valid, work_type_error = validate_work_type(work_type)
-        residence_type_valid, residence_type_error = validate_residence_type(residence_type)
-        glucose_valid, glucose_error, glucose_float = validate_avg_glucose_level(avg_glucose_level)
-        bmi_valid, bmi_error, bmi_float = validate_bmi(bmi)
-        smoking_valid, smoking_error = validate_smoking_status(smoking_status)
-        
-        # Check all validations
-        if not name_valid:
-            flash(name_error, "danger")
-            return render_template("patients/add.html")
-        if not age_valid:
-            flash(age_error, "danger")
-            return render_template("patients/add.html")
-        if not gender_valid:
-            flash(gender_error, "danger")
-            return render_template("patients/add.html")
-        if not hypertension_valid:
-            flash(hypertension_error, "danger")
-            return render_template("patients/add.html")
-        if not ever_married_valid:
-            flash(ever_married_error, "danger")
-            return render_template("patients/add.html")
-        if not work_type_valid:
-            flash(work_type_error, "danger")
+        valid, error, patient_data = validate_patient_payload(request.form)
+        if not valid:
+            flash(error, "danger")
             return render_template("patients/add.html")
-        if not residence_type_valid:
-            flash(residence_type_error, "danger")
-            return render_template("patients/add.html")
-        if not glucose_valid:
-            flash(glucose_error, "danger")
-            return render_template("patients/add.html")
-        if not bmi_valid:
-            flash(bmi_error, "danger")
-            return render_template("patients/add.html")
-        if not smoking_valid:
-            flash(smoking_error, "danger")
-            return render_template("patients/add.html")
-        
-        # Create patient data dictionary
-        patient_data = {
-            "name": name,
-            "age": age_int,
-            "gender": gender,
-            "hypertension": hypertension_int,
-            "ever_married": ever_married,
-            "work_type": work_type,
-            "residence_type": residence_type,
-            "avg_glucose_level": glucose_float,
-            "bmi": bmi_float,
-            "smoking_status": smoking_status
-        }
         
         try:
             create_patient(patient_data)
@@ -137,75 +116,10 @@ def edit_patient(id):
         return redirect("/patients")
     
     if request.method == "POST":
-        # Get and validate all form fields
-        name = request.form.get("name", "").strip()
-        age = request.form.get("age", "").strip()
-        gender = request.form.get("gender", "")
-        hypertension = request.form.get("hypertension", "")
-        ever_married = request.form.get("ever_married", "")
-        work_type = request.form.get("work_type", "")
-        residence_type = request.form.get("residence_type", "")
-        avg_glucose_level = request.form.get("avg_glucose_level", "").strip()
-        bmi = request.form.get("bmi", "").strip()
-        smoking_status = request.form.get("smoking_status", "")
-        
-        # Validate all inputs
-        name_valid, name_error = validate_patient_name(name)
-        age_valid, age_error, age_int = validate_patient_age(age)
-        gender_valid, gender_error = validate_gender(gender)
-        hypertension_valid, hypertension_error, hypertension_int = validate_hypertension(hypertension)
-        ever_married_valid, ever_married_error = validate_ever_married(ever_married)
-        work_type_valid, work_type_error = validate_work_type(work_type)
-        residence_type_valid, residence_type_error = validate_residence_type(residence_type)
-        glucose_valid, glucose_error, glucose_float = validate_avg_glucose_level(avg_glucose_level)
-        bmi_valid, bmi_error, bmi_float = validate_bmi(bmi)
-        smoking_valid, smoking_error = validate_smoking_status(smoking_status)
-        
-        # Check all validations
-        if not name_valid:
-            flash(name_error, "danger")
-            return render_template("patients/edit.html", patient=patient)
-        if not age_valid:
-            flash(age_error, "danger")
-            return render_template("patients/edit.html", patient=patient)
-        if not gender_valid:
-            flash(gender_error, "danger")
+        valid, error, patient_data = validate_patient_payload(request.form)
+        if not valid:
+            flash(error, "danger")
             return render_template("patients/edit.html", patient=patient)
-        if not hypertension_valid:
-            flash(hypertension_error, "danger")
-            return render_template("patients/edit.html", patient=patient)
-        if not ever_married_valid:
-            flash(ever_married_error, "danger")
-            return render_template("patients/edit.html", patient=patient)
-        if not work_type_valid:
-            flash(work_type_error, "danger")
-            return render_template("patients/edit.html", patient=patient)
-        if not residence_type_valid:
-            flash(residence_type_error, "danger")
-            return render_template("patients/edit.html", patient=patient)
-        if not glucose_valid:
-            flash(glucose_error, "danger")
-            return render_template("patients/edit.html", patient=patient)
-        if not bmi_valid:
-            flash(bmi_error, "danger")
-            return render_template("patients/edit.html", patient=patient)
-        if not smoking_valid:
-            flash(smoking_error, "danger")
-            return render_template("patients/edit.html", patient=patient)
-        
-        # Update patient data
-        patient_data = {
-            "name": name,
-            "age": age_int,
-            "gender": gender,
-            "hypertension": hypertension_int,
-            "ever_married": ever_married,
-            "work_type": work_type,
-            "residence_type": residence_type,
-            "avg_glucose_level": glucose_float,
-            "bmi": bmi_float,
-            "smoking_status": smoking_status
-        }
         
         try:
             result = update_patient(id, patient_data)
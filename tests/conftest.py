@@ -0,0 +1,57 @@
+"""
+Shared pytest fixtures for the Stroke Secure test suite.
+"""
+
+import sqlite3
+import uuid
+from pathlib import Path
+
+import pytest
+
+import models.auth_model as auth_model
+import utils.model_predictor as model_predictor
+
+MODEL_FILE = Path(__file__).resolve().parent.parent / "modeltraining" / "stroke_model.pkl"
+
+
+@pytest.fixture(scope="session")
+def predictor():
+    """
+    Load the trained model once per test session.
+    The loaded instance is also installed as the shared predictor, so code
+    under test that calls get_predictor() reuses it instead of reading the
+    model file again. Tests that need a fresh predictor can construct their
+    own StrokePredictor.
+    """
+    if not MODEL_FILE.exists():
+        pytest.skip("Trained model file not available")
+
+    original = model_predictor._predictor
+    loaded = model_predictor.StrokePredictor(model_path=MODEL_FILE)
+    loaded.load_model()
+    model_predictor._predictor = loaded
+
+    yield loaded
+
+    model_predictor._predictor = original
+
+
+@pytest.fixture(scope="function")
+def setup_db():
+    """
+    Setup a fresh in-memory test database before each test.
+    """
+    original_db_path = auth_model.DB_PATH
+    test_db_uri = f"file:auth_test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+    # Keep one connection open so the shared in-memory database lives for
+    # the whole test, even when the pool has no connections checked out
+    keepalive = sqlite3.connect(test_db_uri, uri=True)
+    auth_model.set_db_path(test_db_uri)
+
+    auth_model.init_auth_db()
+
+    yield
+
+    auth_model.set_db_path(original_db_path)
+    keepalive.close()
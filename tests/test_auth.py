@@ -3,34 +3,40 @@ Unit tests for authentication functionality.
 Tests user creation, authentication, and validation.
 """
 
-import os
+from types import SimpleNamespace
 
 import pytest
+from werkzeug.security import generate_password_hash
 
-from models.auth_model import DB_PATH, User, init_auth_db, set_db_path
+from models import auth_model
+from models.auth_model import PASSWORD_HASH_METHOD, User, set_db_path
 from utils.validation import validate_username, validate_password
 
 
-@pytest.fixture(scope="function")
-def setup_db(tmp_path):
+def _stored_hash(username):
     """
-    Setup a temporary test database before each test.
+    Read a user's password hash straight from the test database.
     """
-    original_db_path = DB_PATH
-    test_db_path = tmp_path / "auth_test.db"
-    set_db_path(str(test_db_path))
+    with auth_model._checkout() as conn:
+        return conn.execute("SELECT password FROM users WHERE username=?", (username,)).fetchone()[0]
 
-    init_auth_db()
 
-    yield
+def _insert_legacy_user(username, password):
+    """
+    Insert a user whose password was hashed with an older method.
+    """
+    legacy_hash = generate_password_hash(password, method="pbkdf2:sha256")
+    with auth_model._checkout() as conn:
+        conn.execute("INSERT INTO users(username,password) VALUES(?,?)", (username, legacy_hash))
+    return legacy_hash
 
-    set_db_path(original_db_path)
 
-    if test_db_path.exists():
-        try:
-            os.remove(test_db_path)
-        except PermissionError:
-            pass
+def _rename_user(uid, username):
+    """
+    Change a username directly in the test database, bypassing the cache.
+    """
+    with auth_model._checkout() as conn:
+        conn.execute("UPDATE users SET username=? WHERE id=?", (username, uid))
 
 
 class TestUserModel:
@@ -39,7 +45,7 @@ class TestUserModel:
     def test_user_creation(self, setup_db):
         """Test creating a new user."""
         result = User.create("testuser", "testpass123")
-        assert result is True
+        assert isinstance(result, int)
         
         # Verify user exists
         user = User.authenticate("testuser", "testpass123")
@@ -72,7 +78,7 @@ class TestUserModel:
         User.create("testuser", "testpass123")
         result = User.create("testuser", "anotherpass")
         
-        assert result is False
+        assert result is None
     
     def test_get_user_by_id(self, setup_db):
         """Test retrieving user by ID."""
@@ -84,6 +90,31 @@ class TestUserModel:
         assert retrieved_user.username == "testuser"
         assert retrieved_user.id == auth_user.id
     
+    def test_legacy_hash_upgraded_on_login(self, setup_db):
+        """Test that a legacy password hash is replaced after a successful login."""
+        _insert_legacy_user("legacyuser", "testpass123")
+        
+        user = User.authenticate("legacyuser", "testpass123")
+        assert user is not None
+        assert user.password.startswith(PASSWORD_HASH_METHOD + "$")
+        assert _stored_hash("legacyuser") == user.password
+        
+        # The old password still works against the new hash
+        assert User.authenticate("legacyuser", "testpass123") is not None
+        assert User.authenticate("legacyuser", "wrongpass") is None
+    
+    def test_failed_login_keeps_legacy_hash(self, setup_db):
+        """Test that a failed login does not rewrite the stored hash."""
+        legacy_hash = _insert_legacy_user("legacyuser", "testpass123")
+        
+        assert User.authenticate("legacyuser", "wrongpass") is None
+        assert _stored_hash("legacyuser") == legacy_hash
+    
+    def test_private_memory_db_rejected(self, setup_db):
+        """Test that a per-connection :memory: database is refused."""
+        with pytest.raises(ValueError):
+            set_db_path(":memory:")
+    
     def test_username_exists(self, setup_db):
         """Test username existence check."""
         assert User.username_exists("testuser") is False
@@ -93,6 +124,70 @@ class TestUserModel:
         assert User.username_exists("nonexistent") is False
 
 
+class TestUserCache:
+    """Test cases for the get_by_id user cache."""
+    
+    def test_cached_until_invalidated(self, setup_db):
+        """Test that cached rows are served until the user is invalidated."""
+        uid = User.create("testuser", "testpass123")
+        assert User.get_by_id(uid).username == "testuser"
+        
+        _rename_user(uid, "renamed")
+        assert User.get_by_id(uid).username == "testuser"
+        
+        User._invalidate(uid)
+        assert User.get_by_id(uid).username == "renamed"
+    
+    def test_cache_entry_expires(self, setup_db, monkeypatch):
+        """Test that a cached row is reloaded after USER_CACHE_TTL seconds."""
+        clock = SimpleNamespace(now=1000.0)
+        monkeypatch.setattr(auth_model, "time", SimpleNamespace(monotonic=lambda: clock.now))
+        monkeypatch.setattr(auth_model, "USER_CACHE_TTL", 10)
+        
+        uid = User.create("testuser", "testpass123")
+        User.get_by_id(uid)
+        _rename_user(uid, "renamed")
+        
+        clock.now += 5
+        assert User.get_by_id(uid).username == "testuser"
+        
+        clock.now += 10
+        assert User.get_by_id(uid).username == "renamed"
+    
+    def test_least_recently_used_evicted(self, setup_db, monkeypatch):
+        """Test that the least recently used row is dropped when the cache is full."""
+        monkeypatch.setattr(auth_model, "USER_CACHE_SIZE", 2)
+        first = User.create("first", "testpass123")
+        second = User.create("second", "testpass123")
+        third = User.create("third", "testpass123")
+        
+        User.get_by_id(first)
+        User.get_by_id(second)
+        User.get_by_id(first)
+        User.get_by_id(third)
+        
+        assert list(auth_model._user_cache) == [str(first), str(third)]
+    
+    def test_rehash_invalidates_cache(self, setup_db):
+        """Test that upgrading a legacy hash refreshes the cached row."""
+        _insert_legacy_user("legacyuser", "testpass123")
+        with auth_model._checkout() as conn:
+            uid = conn.execute("SELECT id FROM users WHERE username=?", ("legacyuser",)).fetchone()[0]
+        assert not User.get_by_id(uid).password.startswith(PASSWORD_HASH_METHOD + "$")
+        
+        User.authenticate("legacyuser", "testpass123")
+        assert User.get_by_id(uid).password.startswith(PASSWORD_HASH_METHOD + "$")
+    
+    def test_set_db_path_clears_cache(self, setup_db):
+        """Test that switching databases drops cached rows."""
+        uid = User.create("testuser", "testpass123")
+        User.get_by_id(uid)
+        assert auth_model._user_cache
+        
+        set_db_path(auth_model.DB_PATH)
+        assert not auth_model._user_cache
+
+
 class TestInputValidation:
     """Test cases for input validation."""
     
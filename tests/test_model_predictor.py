@@ -0,0 +1,83 @@
+"""
+Unit tests for the stroke prediction helpers.
+Tests single and batch predictions against the trained model.
+"""
+
+import numpy as np
+import pytest
+
+from utils.model_predictor import StrokePredictor, get_predictor
+
+PATIENTS = [
+    {
+        "gender": "Male", "age": 67, "hypertension": 0, "ever_married": "Yes",
+        "work_type": "Private", "residence_type": "Urban",
+        "avg_glucose_level": 228.69, "bmi": 36.6, "smoking_status": "formerly smoked",
+    },
+    {
+        "gender": "Female", "age": "45", "hypertension": "1", "ever_married": "No",
+        "work_type": "Self-employed", "residence_type": "Rural",
+        "avg_glucose_level": "90", "bmi": "22", "smoking_status": "Unknown",
+    },
+    {
+        "gender": "Female", "age": 3, "hypertension": 0, "ever_married": "No",
+        "work_type": "children", "residence_type": "Rural",
+        "avg_glucose_level": 80, "bmi": None, "smoking_status": "never smoked",
+    },
+]
+
+
+class TestStrokePredictor:
+    """Test cases for StrokePredictor."""
+
+    def test_predict_matches_pipeline(self, predictor):
+        """Test that predictions agree with the sklearn pipeline."""
+        for patient in PATIENTS:
+            prediction, probability = predictor.predict(patient)
+            expected = predictor.model.predict_proba(predictor.prepare_features(patient))[0][1]
+            assert probability == pytest.approx(expected, abs=1e-5)
+            assert prediction == (1 if probability >= predictor.threshold else 0)
+
+    def test_predict_batch_matches_predict(self, predictor):
+        """Test that batch predictions agree with single predictions."""
+        predictions, probabilities = predictor.predict_batch(PATIENTS)
+        assert len(predictions) == len(PATIENTS)
+        for patient, prediction, probability in zip(PATIENTS, predictions, probabilities):
+            single_prediction, single_probability = predictor.predict(patient)
+            assert probability == pytest.approx(single_probability, abs=1e-5)
+            assert prediction == single_prediction
+
+    def test_predict_batch_matches_pipeline(self, predictor):
+        """Test that batch probabilities agree with the sklearn pipeline."""
+        _, probabilities = predictor.predict_batch(PATIENTS)
+        for patient, probability in zip(PATIENTS, probabilities):
+            expected = predictor.model.predict_proba(predictor.prepare_features(patient))[0][1]
+            assert probability == pytest.approx(expected, abs=1e-5)
+
+    def test_prepare_features_batch(self, predictor):
+        """Test that the batch DataFrame scores like single-row DataFrames."""
+        features = predictor.prepare_features_batch(PATIENTS)
+        assert list(features.columns) == list(predictor.prepare_features(PATIENTS[0]).columns)
+        assert len(features) == len(PATIENTS)
+        for column in ("age", "avg_glucose_level", "bmi"):
+            assert features[column].dtype == np.float32
+        probabilities = predictor.model.predict_proba(features)[:, 1]
+        for patient, probability in zip(PATIENTS, probabilities):
+            expected = predictor.model.predict_proba(predictor.prepare_features(patient))[0][1]
+            assert probability == pytest.approx(expected, abs=1e-5)
+
+    def test_predict_batch_empty(self, predictor):
+        """Test batch prediction with no patients."""
+        predictions, probabilities = predictor.predict_batch([])
+        assert len(predictions) == 0
+        assert len(probabilities) == 0
+
+    def test_get_predictor_reuses_session_model(self, predictor):
+        """Test that the shared predictor is the session-loaded instance."""
+        assert get_predictor() is predictor
+
+    def test_missing_model_file(self, tmp_path):
+        """Test that a missing model file raises FileNotFoundError."""
+        model = StrokePredictor(model_path=tmp_path / "missing.pkl")
+        with pytest.raises(FileNotFoundError):
+            model.load_model()
@@ -4,8 +4,13 @@ Tests patient CRUD operations and validation.
 """
 
 import pytest
+from pymongo import InsertOne
+from models import patient_model
 from models.patient_model import create_patient, get_all_patients, get_patient, update_patient, delete_patient
-from utils.validation import validate_patient_name, validate_patient_age, validate_object_id
+from utils.validation import (
+    validate_patient_name, validate_patient_age, validate_object_id,
+    validate_avg_glucose_level, validate_bmi, validate_patient_payload
+)
 from bson import ObjectId
 
 
@@ -40,6 +45,25 @@ class TestPatientValidation:
         valid, error = validate_patient_name("John123")
         assert valid is False
         assert "letters" in error.lower()
+        
+        # Whitespace only
+        valid, error = validate_patient_name("   ")
+        assert valid is False
+        assert "required" in error.lower()
+        
+        # Too short once surrounding whitespace is removed
+        valid, error = validate_patient_name("  A  ")
+        assert valid is False
+        assert "2 characters" in error
+        
+        # Too long
+        valid, error = validate_patient_name("a" * 101)
+        assert valid is False
+        assert "too long" in error.lower()
+        
+        valid, error = validate_patient_name("a" * 100000)
+        assert valid is False
+        assert "too long" in error.lower()
     
     def test_validate_patient_age_valid(self):
         """Test validation of valid patient ages."""
@@ -55,6 +79,11 @@ class TestPatientValidation:
         valid, error, age = validate_patient_age("150")
         assert valid is True
         assert age == 150
+        
+        # Already-parsed ints are accepted as-is
+        valid, error, age = validate_patient_age(42)
+        assert valid is True
+        assert age == 42
     
     def test_validate_patient_age_invalid(self):
         """Test validation of invalid patient ages."""
@@ -79,6 +108,64 @@ class TestPatientValidation:
         valid, error, age = validate_patient_age("200")
         assert valid is False
         assert "150" in error
+        
+        # Missing value
+        valid, error, age = validate_patient_age(None)
+        assert valid is False
+        assert "required" in error.lower()
+    
+    def test_validate_glucose_and_bmi(self):
+        """Test validation of glucose level and BMI values."""
+        valid, error, value = validate_avg_glucose_level("100.5")
+        assert valid is True
+        assert value == 100.5
+        
+        valid, error, value = validate_bmi("22")
+        assert valid is True
+        assert value == 22.0
+        
+        # Zero is a value, not a missing field
+        assert validate_avg_glucose_level("0") == (True, "", 0.0)
+        assert validate_bmi(0.0) == (True, "", 0.0)
+        
+        valid, error, value = validate_bmi("")
+        assert valid is False
+        assert "required" in error.lower()
+        
+        valid, error, value = validate_avg_glucose_level("-1")
+        assert valid is False
+        assert "negative" in error.lower()
+        
+        valid, error, value = validate_bmi("101")
+        assert valid is False
+        assert "100" in error
+    
+    def test_validate_patient_payload(self):
+        """Test validation of a complete patient form."""
+        form = {
+            "name": " John Doe ", "age": "45", "gender": "Male", "hypertension": "1",
+            "ever_married": "Yes", "work_type": "Private", "residence_type": "Urban",
+            "avg_glucose_level": "90.5", "bmi": "22", "smoking_status": "Smokes",
+        }
+        valid, error, data = validate_patient_payload(form)
+        assert valid is True
+        assert error == ""
+        assert data["name"] == "John Doe"
+        assert data["age"] == 45
+        assert data["hypertension"] == 1
+        assert data["avg_glucose_level"] == 90.5
+        assert data["bmi"] == 22.0
+        
+        # First invalid field is reported
+        valid, error, data = validate_patient_payload(dict(form, age="abc", gender="x"))
+        assert valid is False
+        assert "number" in error.lower()
+        assert data is None
+        
+        # Missing fields are treated as empty
+        valid, error, data = validate_patient_payload({"name": "John Doe"})
+        assert valid is False
+        assert "age is required" in error.lower()
     
     def test_validate_object_id(self):
         """Test validation of MongoDB ObjectId."""
@@ -93,8 +180,97 @@ class TestPatientValidation:
         assert valid is False
         assert "invalid" in error.lower()
         
+        # Right length but not hex
+        valid, error = validate_object_id("z" * 24)
+        assert valid is False
+        assert "invalid" in error.lower()
+        
         # Empty ID
         valid, error = validate_object_id("")
         assert valid is False
         assert "required" in error.lower()
 
+
+class _RecordingCollection:
+    """
+    Stand-in for the patients collection that records calls instead of
+    talking to MongoDB.
+    """
+    
+    def __init__(self):
+        self.calls = []
+    
+    def insert_one(self, doc):
+        self.calls.append(("insert_one", doc))
+        return "insert_one_result"
+    
+    def bulk_write(self, requests, ordered=True):
+        self.calls.append(("bulk_write", requests, ordered))
+        return len(requests)
+    
+    def aggregate(self, pipeline, **kwargs):
+        self.calls.append(("aggregate", pipeline, kwargs))
+        return iter([{"name": "Jane Doe"}])
+
+
+@pytest.fixture
+def patients_stub(monkeypatch):
+    """
+    Replace the patients collection with a _RecordingCollection.
+    """
+    stub = _RecordingCollection()
+    monkeypatch.setattr(patient_model, "patients", stub)
+    return stub
+
+
+class TestPatientModel:
+    """Test cases for patient model queries, using a stubbed collection."""
+    
+    def test_create_patient_single(self, patients_stub):
+        """Test that a single patient dict is inserted with insert_one."""
+        doc = {"name": "Jane Doe"}
+        assert create_patient(doc) == "insert_one_result"
+        assert patients_stub.calls == [("insert_one", doc)]
+    
+    def test_create_patient_list_chunked(self, patients_stub):
+        """Test that a list of patients is sent as unordered bulk writes of 1000."""
+        docs = [{"name": f"Patient {i}"} for i in range(2500)]
+        results = create_patient(docs)
+        
+        assert [call[0] for call in patients_stub.calls] == ["bulk_write"] * 3
+        assert results == [1000, 1000, 500]
+        assert all(call[2] is False for call in patients_stub.calls)
+        
+        sent = [request for call in patients_stub.calls for request in call[1]]
+        assert sent == [InsertOne(doc) for doc in docs]
+    
+    def test_create_patient_empty_list(self, patients_stub):
+        """Test that an empty list makes no database call."""
+        assert create_patient([]) == []
+        assert patients_stub.calls == []
+    
+    def test_list_patients_page_pipeline(self, patients_stub):
+        """Test that one list page is sorted, paged and projected by MongoDB."""
+        result = patient_model.list_patients_page(100, 51)
+        assert result == [{"name": "Jane Doe"}]
+        
+        (name, pipeline, _), = patients_stub.calls
+        assert name == "aggregate"
+        assert pipeline == [
+            {"$sort": {"name": 1, "_id": 1}},
+            {"$skip": 100},
+            {"$limit": 51},
+            {"$project": patient_model.LIST_PROJECTION},
+        ]
+        # _id must follow the sort field as the tie-break
+        assert list(pipeline[0]["$sort"]) == ["name", "_id"]
+    
+    def test_list_patients_page_sort_field(self, patients_stub):
+        """Test that only listed fields can be used for sorting."""
+        patient_model.list_patients_page(0, 10, sort_field="age")
+        assert patients_stub.calls[0][1][0] == {"$sort": {"age": 1, "_id": 1}}
+        
+        with pytest.raises(ValueError):
+            patient_model.list_patients_page(0, 10, sort_field="password")
+        assert len(patients_stub.calls) == 1
+
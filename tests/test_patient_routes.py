@@ -0,0 +1,109 @@
+"""
+Unit tests for the patient routes.
+Tests conditional GET handling on the patient list.
+"""
+
+import pytest
+
+import app as app_module
+import routes.patient_routes as patient_routes
+from models.auth_model import User
+
+PATIENTS = [
+    {
+        "_id": "0123456789abcdef01234567", "name": "Jane Doe", "age": 45,
+        "gender": "Female", "hypertension": 0, "avg_glucose_level": 90.0, "bmi": 22.0,
+    },
+]
+
+
+@pytest.fixture
+def client(setup_db, monkeypatch):
+    """
+    Test client logged in as a fresh user, with the patient list served from
+    an in-memory list instead of MongoDB.
+    """
+    rows = [dict(patient) for patient in PATIENTS]
+    monkeypatch.setattr(
+        patient_routes, "list_patients_page", lambda skip, limit, sort_field="name": rows[skip:skip + limit]
+    )
+
+    # Skip the background index setup and model warm-up threads
+    monkeypatch.setattr(app_module, "init_patient_db", lambda: None)
+    monkeypatch.setattr(app_module, "warm_predictor", lambda: None)
+
+    app = app_module.create_app()
+    app.config["TESTING"] = True
+    client = app.test_client()
+    uid = User.create("testuser", "testpass123")
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(uid)
+        sess["_fresh"] = True
+    client.rows = rows
+    return client
+
+
+class TestPatientListETag:
+    """Test cases for ETag handling on the patient list."""
+
+    def test_not_modified_when_unchanged(self, client):
+        """Test that a matching If-None-Match gets a 304 without a body."""
+        response = client.get("/patients/")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        response = client.get("/patients/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+
+    def test_not_modified_for_weak_etag(self, client):
+        """Test that a weak If-None-Match, as sent back through gzip proxies, gets a 304."""
+        etag = client.get("/patients/").headers["ETag"]
+
+        response = client.get("/patients/", headers={"If-None-Match": f"W/{etag}"})
+        assert response.status_code == 304
+
+    def test_changed_data_gets_new_page(self, client):
+        """Test that a data change invalidates the previous ETag."""
+        etag = client.get("/patients/").headers["ETag"]
+
+        client.rows[0]["age"] = 46
+        response = client.get("/patients/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_etag_depends_on_user(self, client):
+        """Test that another user never matches the first user's ETag."""
+        etag = client.get("/patients/").headers["ETag"]
+
+        uid = User.create("otheruser", "testpass123")
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(uid)
+        response = client.get("/patients/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_pending_flash_skips_etag(self, client):
+        """Test that a page with pending flash messages is always rendered."""
+        etag = client.get("/patients/").headers["ETag"]
+
+        with client.session_transaction() as sess:
+            sess["_flashes"] = [("success", "Patient added successfully!")]
+        response = client.get("/patients/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert b"Patient added successfully!" in response.data
+        assert "ETag" not in response.headers
+
+
+class TestPatientListRendering:
+    """Test cases for values shown on the patient list."""
+
+    def test_zero_measurements_shown(self, client):
+        """Test that stored zero glucose and BMI render as numbers, not N/A."""
+        client.rows[0]["avg_glucose_level"] = 0.0
+        client.rows[0]["bmi"] = 0.0
+        response = client.get("/patients/")
+        assert response.data.count(b"<td>0.00</td>") == 2
+        assert b"<td>N/A</td>" not in response.data
@@ -3,15 +3,186 @@ Machine learning inference helpers that mirror the preprocessing + model
 pipeline defined in `modeltraining/Model_Training.ipynb`.
 """
 
+import os
+import threading
+import warnings
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-import joblib
-import pandas as pd
+import numpy as np
+
+# pandas, joblib and (through the pickle) sklearn are imported on first load
+# rather than here, so importing the app doesn't pay for them at startup.
+if TYPE_CHECKING:
+    import pandas as pd
 
 MODEL_PATH = Path("modeltraining/stroke_model.pkl")
 # Require at least 75% probability before flagging a very high heart-attack risk
 PREDICTION_THRESHOLD = 0.75
+# Column order of the training DataFrame in modeltraining/Model_Training.py
+FEATURE_COLUMNS = [
+    "gender",
+    "age",
+    "hypertension",
+    "ever_married",
+    "work_type",
+    "Residence_type",
+    "avg_glucose_level",
+    "bmi",
+    "smoking_status",
+]
+
+
+def _as_float(value, default: float = 0.0) -> float:
+    # Stored documents already hold numbers; only strings and odd types
+    # need the guarded conversion
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _as_int(value, default: int = 0) -> int:
+    if isinstance(value, int):
+        return int(value)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class _LinearScorer:
+    """
+    Scores one patient with plain numpy using parameters extracted from the
+    fitted preprocessing + logistic regression pipeline, skipping the pandas
+    DataFrame and the ColumnTransformer dispatch.
+    """
+
+    def __init__(self, model):
+        preprocess = model.named_steps["preprocess"]
+        classifier = model.named_steps["classifier"]
+        names = list(preprocess.feature_names_in_)
+
+        # (column, output index, fill value, mean, scale) per numeric feature
+        self.numeric = []
+        # column -> (fill value, {category: output index}) per categorical feature
+        self.onehot = {}
+        # (column, output index) per passthrough feature
+        self.passthrough = []
+
+        with warnings.catch_warnings():
+            # Remainder columns may be stored as indices or names depending on
+            # the sklearn version; both are handled below.
+            warnings.simplefilter("ignore", FutureWarning)
+            transformers = [(n, t, list(c)) for n, t, c in preprocess.transformers_]
+
+        offset = 0
+        for name, transformer, columns in transformers:
+            if isinstance(transformer, str) and transformer == "drop":
+                continue
+            columns = [names[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+            if name == "remainder" or (isinstance(transformer, str) and transformer == "passthrough"):
+                if name == "remainder" and preprocess.remainder != "passthrough":
+                    raise ValueError("Unsupported remainder transformer")
+                for column in columns:
+                    self.passthrough.append((column, offset))
+                    offset += 1
+            elif name == "num":
+                imputer = transformer.named_steps["imputer"]
+                scaler = transformer.named_steps["scaler"]
+                for i, column in enumerate(columns):
+                    mean = scaler.mean_[i] if scaler.with_mean else 0.0
+                    scale = scaler.scale_[i] if scaler.with_std else 1.0
+                    self.numeric.append((column, offset, imputer.statistics_[i], mean, scale))
+                    offset += 1
+            elif name == "cat":
+                imputer = transformer.named_steps["imputer"]
+                encoder = transformer.named_steps["onehot"]
+                if encoder.drop_idx_ is not None or getattr(encoder, "infrequent_categories_", None):
+                    raise ValueError("Unsupported one-hot encoder configuration")
+                for i, column in enumerate(columns):
+                    index = {}
+                    for category in encoder.categories_[i]:
+                        index[category] = offset
+                        offset += 1
+                    self.onehot[column] = (imputer.statistics_[i], index)
+            else:
+                raise ValueError(f"Unsupported transformer {name!r}")
+
+        self.coef = np.asarray(classifier.coef_[0], dtype=np.float64)
+        self.intercept = float(classifier.intercept_[0])
+        if self.coef.shape[0] != offset:
+            raise ValueError("Classifier coefficients do not match encoded features")
+        self.n_features = offset
+
+    def encode(self, payload: Dict) -> np.ndarray:
+        """
+        Build the encoded feature vector the classifier was trained on.
+        """
+        x = np.zeros(self.n_features, dtype=np.float32)
+        for column, idx, fill, mean, scale in self.numeric:
+            value = payload[column]
+            if value is None or value != value:
+                value = fill
+            x[idx] = (value - mean) / scale
+        for column, (fill, index) in self.onehot.items():
+            value = payload[column]
+            # The imputer only treats NaN as missing; None falls through to
+            # the encoder as an unknown category like any other unseen value.
+            if value is not None and value != value:
+                value = fill
+            idx = index.get(value)
+            # Unknown categories encode as all zeros (handle_unknown="ignore")
+            if idx is not None:
+                x[idx] = 1.0
+        for column, idx in self.passthrough:
+            x[idx] = payload[column]
+        return x
+
+    def predict_proba(self, payload: Dict) -> float:
+        """
+        Return the positive-class probability for one patient payload.
+        """
+        z = float(self.encode(payload) @ self.coef) + self.intercept
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def encode_batch(self, columns: Dict[str, List], n_rows: int) -> np.ndarray:
+        """
+        Build the encoded feature matrix for many patients at once.
+        `columns` maps each training column name to its values, one per row;
+        output columns follow the same order as encode().
+        """
+        X = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        rows = np.arange(n_rows)
+        for column, idx, fill, mean, scale in self.numeric:
+            # None becomes NaN here and is imputed with the rest
+            values = np.asarray(columns[column], dtype=np.float64)
+            values = np.where(np.isnan(values), fill, values)
+            X[:, idx] = (values - mean) / scale
+        for column, (fill, index) in self.onehot.items():
+            # -1 marks unknown categories, which stay all zeros
+            cols = np.fromiter(
+                (
+                    index.get(fill if value is not None and value != value else value, -1)
+                    for value in columns[column]
+                ),
+                dtype=np.intp,
+                count=n_rows,
+            )
+            known = cols >= 0
+            X[rows[known], cols[known]] = 1.0
+        for column, idx in self.passthrough:
+            X[:, idx] = columns[column]
+        return X
+
+    def predict_proba_batch(self, columns: Dict[str, List], n_rows: int) -> np.ndarray:
+        """
+        Return positive-class probabilities for a batch of patients.
+        """
+        z = self.encode_batch(columns, n_rows) @ self.coef + self.intercept
+        return 1.0 / (1.0 + np.exp(-z))
 
 
 class StrokePredictor:
@@ -23,56 +194,140 @@ class StrokePredictor:
         self.model_path = Path(model_path)
         self.threshold = threshold
         self.model = None
+        self._scorer: Optional[_LinearScorer] = None
+        self._load_lock = threading.Lock()
 
     def load_model(self) -> None:
         """
         Load the trained model pipeline from disk (lazy-loaded).
+        Accepts either a bare pipeline or the {"model", "threshold"} bundle
+        written by the training notebook. Safe to call from several threads;
+        only the first caller loads the file.
         """
         if self.model is not None:
             return
 
+        with self._load_lock:
+            if self.model is None:
+                self._load()
+
+    def _load(self) -> None:
+        """
+        Read the model file and build the fast scorer. Caller holds _load_lock.
+        """
         if not self.model_path.exists():
             raise FileNotFoundError(
                 f"Model file not found at {self.model_path}. "
                 "Please export stroke_model.pkl from the training notebook into modeltraining/."
             )
 
+        import joblib
+
         try:
-            self.model = joblib.load(self.model_path)
+            loaded = joblib.load(self.model_path)
         except Exception as exc:  # pragma: no cover - guarded path
             raise FileNotFoundError(f"Error loading model: {exc}") from exc
 
-    @staticmethod
-    def _as_float(value, default: float = 0.0) -> float:
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return default
+        if isinstance(loaded, dict):
+            self.threshold = loaded.get("threshold", self.threshold)
+            loaded = loaded["model"]
+        # Publish the model last: other threads treat it as "loaded"
+        self._scorer = self._build_scorer(loaded)
+        self.model = loaded
+
+    def _build_scorer(self, model) -> Optional[_LinearScorer]:
+        """
+        Extract a numpy scorer from the pipeline, or None if the pipeline has a
+        shape we don't recognise. The scorer is checked against the pipeline's
+        own predict_proba before it is used.
+        """
+        import pandas as pd
 
-    @staticmethod
-    def _as_int(value, default: int = 0) -> int:
         try:
-            return int(value)
-        except (TypeError, ValueError):
-            return default
+            scorer = _LinearScorer(model)
+            # Probe rows keep the training column order so sklearn accepts them
+            columns = list(model.named_steps["preprocess"].feature_names_in_)
+            probes = []
+            for step in (0.0, 1.0):
+                probe = dict.fromkeys(columns)
+                for column, _, fill, _, _ in scorer.numeric:
+                    probe[column] = float(fill) + step
+                for column, (fill, _) in scorer.onehot.items():
+                    probe[column] = fill
+                for column, _ in scorer.passthrough:
+                    probe[column] = int(step)
+                probes.append(probe)
+            expected = model.predict_proba(pd.DataFrame(probes))[:, 1]
+            single = np.array([scorer.predict_proba(probe) for probe in probes])
+            batch = scorer.predict_proba_batch(
+                {column: [probe[column] for probe in probes] for column in columns}, len(probes)
+            )
+            if not (np.allclose(single, expected, rtol=0, atol=1e-5)
+                    and np.allclose(batch, expected, rtol=0, atol=1e-5)):
+                return None
+            return scorer
+        except Exception:
+            return None
 
-    def prepare_features(self, patient_data: Dict) -> pd.DataFrame:
+    def _payload(self, patient_data: Dict) -> Dict:
         """
-        Convert Mongo patient document into the DataFrame the pipeline expects.
+        Map a Mongo patient document onto the training column names.
         """
-        payload = {
+        return {
             "gender": patient_data.get("gender"),
-            "age": self._as_float(patient_data.get("age")),
-            "hypertension": self._as_int(patient_data.get("hypertension")),
+            "age": _as_float(patient_data.get("age")),
+            "hypertension": _as_int(patient_data.get("hypertension")),
             "ever_married": patient_data.get("ever_married"),
             "work_type": patient_data.get("work_type"),
             # Training pipeline used a capitalized Residence_type column name.
             "Residence_type": patient_data.get("residence_type"),
-            "avg_glucose_level": self._as_float(patient_data.get("avg_glucose_level")),
-            "bmi": self._as_float(patient_data.get("bmi")),
+            "avg_glucose_level": _as_float(patient_data.get("avg_glucose_level")),
+            "bmi": _as_float(patient_data.get("bmi")),
             "smoking_status": patient_data.get("smoking_status"),
         }
-        return pd.DataFrame([payload])
+
+    def prepare_features(self, patient_data: Dict) -> "pd.DataFrame":
+        """
+        Convert Mongo patient document into the DataFrame the pipeline expects.
+        Uses the same column arrays as the batch path, so numeric features are
+        float32 rather than boxed Python floats widened to float64.
+        """
+        return self.prepare_features_batch([patient_data])
+
+    def _batch_columns(self, patient_list: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Gather many Mongo patient documents into one array per training column.
+        Numeric columns are contiguous float32 arrays; categorical columns are
+        object arrays.
+        """
+        n_rows = len(patient_list)
+
+        def numeric(key, convert, dtype):
+            return np.fromiter((convert(p.get(key)) for p in patient_list), dtype=dtype, count=n_rows)
+
+        def categorical(key):
+            return np.asarray([p.get(key) for p in patient_list], dtype=object)
+
+        return {
+            "gender": categorical("gender"),
+            "age": numeric("age", _as_float, np.float32),
+            "hypertension": numeric("hypertension", _as_int, np.int64),
+            "ever_married": categorical("ever_married"),
+            "work_type": categorical("work_type"),
+            "Residence_type": categorical("residence_type"),
+            "avg_glucose_level": numeric("avg_glucose_level", _as_float, np.float32),
+            "bmi": numeric("bmi", _as_float, np.float32),
+            "smoking_status": categorical("smoking_status"),
+        }
+
+    def prepare_features_batch(self, patient_list: List[Dict]) -> "pd.DataFrame":
+        """
+        Convert many Mongo patient documents into one DataFrame for the pipeline.
+        """
+        import pandas as pd
+
+        columns = self._batch_columns(patient_list)
+        return pd.DataFrame({column: columns[column] for column in FEATURE_COLUMNS})
 
     def predict(self, patient_data: Dict) -> Tuple[int, float]:
         """
@@ -80,27 +335,85 @@ class StrokePredictor:
         Returns the binary prediction (thresholded at 0.75) and the stroke probability.
         """
         self.load_model()
-        features = self.prepare_features(patient_data)
 
-        try:
-            probability = float(self.model.predict_proba(features)[0][1])
-        except AttributeError as exc:  # pragma: no cover - pipeline always exposes proba
-            raise RuntimeError("Loaded model does not expose predict_proba") from exc
+        if self._scorer is not None:
+            probability = self._scorer.predict_proba(self._payload(patient_data))
+        else:
+            features = self.prepare_features(patient_data)
+            try:
+                probability = self.model.predict_proba(features)[0, 1]
+            except AttributeError as exc:  # pragma: no cover - pipeline always exposes proba
+                raise RuntimeError("Loaded model does not expose predict_proba") from exc
+
+        return int(probability >= self.threshold), float(probability)
+
+    def predict_batch(self, patient_list: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict stroke probability for many patient profiles at once.
+        Rows are gathered into per-column arrays once, then encoded into one
+        matrix by the numpy scorer, or passed to the pipeline as one DataFrame
+        if no scorer is available.
+        Returns arrays of binary predictions and stroke probabilities.
+        """
+        self.load_model()
+        if not patient_list:
+            return np.empty(0, dtype=np.int8), np.empty(0, dtype=np.float64)
 
-        prediction = 1 if probability >= self.threshold else 0
-        return prediction, probability
+        if self._scorer is not None:
+            columns = self._batch_columns(patient_list)
+            probabilities = self._scorer.predict_proba_batch(columns, len(patient_list))
+        else:
+            features = self.prepare_features_batch(patient_list)
+            probabilities = self.model.predict_proba(features)[:, 1]
+        # Reinterpret the boolean mask as 0/1 bytes without copying
+        predictions = (probabilities >= self.threshold).view(np.int8)
+        return predictions, probabilities
 
 
 # Global predictor instance for reuse across requests
 _predictor = None
+_predictor_lock = threading.Lock()
+
+
+def _reset_lock_after_fork() -> None:
+    # A background warm-up may hold the lock when a preloading server forks;
+    # give each child a fresh lock so it can load the model itself.
+    global _predictor_lock
+    _predictor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_lock_after_fork)
 
 
 def get_predictor() -> StrokePredictor:
     """
     Provide a memoized predictor instance so we avoid reloading the model repeatedly.
+    The model is loaded once under a lock so concurrent first requests don't
+    each deserialize it.
     """
     global _predictor
     if _predictor is None:
-        _predictor = StrokePredictor()
+        with _predictor_lock:
+            if _predictor is None:
+                predictor = StrokePredictor()
+                predictor.load_model()
+                _predictor = predictor
     return _predictor
 
+
+def warm_predictor() -> None:
+    """
+    Load the shared predictor ahead of the first request.
+    A missing model is ignored here; the predict route reports it to the user.
+    """
+    try:
+        get_predictor()
+    except FileNotFoundError:
+        pass
+
+
+# Opt-in warm-up at import time, e.g. for servers that import the app once
+# and then fork workers
+if os.environ.get("PRELOAD_MODEL"):
+    warm_predictor()
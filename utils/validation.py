@@ -4,7 +4,40 @@ Provides validation functions for user authentication and patient data.
 """
 
 import re
-from bson import ObjectId
+import string
+from functools import lru_cache
+
+# Characters allowed in patient names: letters, whitespace, hyphens, apostrophes.
+# A set check avoids running the regex engine for a plain allow-list.
+_NAME_CHARS = frozenset(string.ascii_letters + string.whitespace + "-'")
+NAME_MIN_LENGTH = 2
+NAME_MAX_LENGTH = 100
+# Raw input longer than this is rejected before it is stripped or scanned
+_NAME_MAX_RAW_LENGTH = 10 * NAME_MAX_LENGTH
+
+# 24 hex characters, the string form of a MongoDB ObjectId (use fullmatch)
+OBJECT_ID_RE = re.compile(r"[0-9a-fA-F]{24}")
+_OBJECT_ID_ERR = "Invalid patient ID format"
+
+# Allowed values for enumerated patient fields. The tuples keep the order
+# used in error messages; the frozensets give O(1) membership checks and the
+# error messages are built once here rather than on every failed call.
+_GENDERS = ("Male", "Female", "Other")
+_GENDER_SET = frozenset(_GENDERS)
+_GENDER_ERR = f"Gender must be one of: {', '.join(_GENDERS)}"
+_EVER_MARRIED = ("No", "Yes")
+_EVER_MARRIED_SET = frozenset(_EVER_MARRIED)
+_EVER_MARRIED_ERR = f"Ever married must be one of: {', '.join(_EVER_MARRIED)}"
+_WORK_TYPES = ("Children", "Govt_job", "Never_worked", "Private", "Self-employed")
+_WORK_TYPE_SET = frozenset(_WORK_TYPES)
+_WORK_TYPE_ERR = f"Work type must be one of: {', '.join(_WORK_TYPES)}"
+_RESIDENCE_TYPES = ("Rural", "Urban")
+_RESIDENCE_TYPE_SET = frozenset(_RESIDENCE_TYPES)
+_RESIDENCE_TYPE_ERR = f"Residence type must be one of: {', '.join(_RESIDENCE_TYPES)}"
+_SMOKING_STATUSES = ("Formerly smoked", "Never smoked", "Smokes", "Unknown")
+_SMOKING_STATUS_SET = frozenset(_SMOKING_STATUSES)
+_SMOKING_STATUS_ERR = f"Smoking status must be one of: {', '.join(_SMOKING_STATUSES)}"
+_HYPERTENSION_ERR = "Hypertension must be 0 (No) or 1 (Yes)"
 
 
 def validate_username(username):
@@ -17,10 +50,11 @@ def validate_username(username):
     Returns:
         tuple: (is_valid: bool, error_message: str)
     """
-    if not username:
+    username_len = len(username) if username is not None else 0
+    if username_len == 0:
         return False, "Username is required"
     
-    if len(username) < 3:
+    if username_len < 3:
         return False, "Username must be at least 3 characters long"
     
     return True, ""
@@ -36,13 +70,14 @@ def validate_password(password):
     Returns:
         tuple: (is_valid: bool, error_message: str)
     """
-    if not password:
+    password_len = len(password) if password is not None else 0
+    if password_len == 0:
         return False, "Password is required"
     
-    if len(password) < 6:
+    if password_len < 6:
         return False, "Password must be at least 6 characters long"
     
-    if len(password) > 100:
+    if password_len > 100:
         return False, "Password is too long"
     
     return True, ""
@@ -58,17 +93,34 @@ def validate_patient_name(name):
     Returns:
         tuple: (is_valid: bool, error_message: str)
     """
-    if not name:
+    if name and len(name) > _NAME_MAX_RAW_LENGTH:
+        return False, "Name is too long"
+    
+    # Strip once so whitespace-only names fail as empty and the length
+    # checks apply to the same text the character check sees
+    name_stripped = name.strip() if name else ""
+    if not name_stripped:
         return False, "Patient name is required"
     
-    if len(name) < 2:
+    return _validate_stripped_name(name_stripped)
+
+
+@lru_cache(maxsize=256)
+def _validate_stripped_name(name):
+    """
+    Run the length and character checks on an already-stripped name.
+    Results are memoized since the same patients are edited repeatedly;
+    keys are bounded by the raw-length guard in validate_patient_name.
+    """
+    name_len = len(name)
+    if name_len < NAME_MIN_LENGTH:
         return False, "Name must be at least 2 characters long"
     
-    if len(name) > 100:
+    if name_len > NAME_MAX_LENGTH:
         return False, "Name is too long"
     
     # Allow letters, spaces, hyphens, and apostrophes
-    if not re.match(r'^[a-zA-Z\s\-\']+$', name.strip()):
+    if not _NAME_CHARS.issuperset(name):
         return False, "Name can only contain letters, spaces, hyphens, and apostrophes"
     
     return True, ""
@@ -84,18 +136,22 @@ def validate_patient_age(age):
     Returns:
         tuple: (is_valid: bool, error_message: str, age_int: int or None)
     """
-    if not age:
+    if age is None or age == "":
         return False, "Age is required", None
     
-    try:
-        age_int = int(age)
-    except (ValueError, TypeError):
-        return False, "Age must be a valid number", None
-    
-    if age_int < 0:
-        return False, "Age cannot be negative", None
+    # Form input arrives as str and stored documents as int; only the
+    # remaining types go through the generic int() conversion
+    if isinstance(age, int):
+        age_int = age
+    else:
+        try:
+            age_int = int(age, 10) if isinstance(age, str) else int(age)
+        except (ValueError, TypeError):
+            return False, "Age must be a valid number", None
     
-    if age_int > 150:
+    if not 0 <= age_int <= 150:
+        if age_int < 0:
+            return False, "Age cannot be negative", None
         return False, "Age must be a reasonable value (less than 150)", None
     
     return True, "", age_int
@@ -114,9 +170,22 @@ def validate_object_id(oid):
     if not oid:
         return False, "ID is required"
     
-    if not ObjectId.is_valid(oid):
-        return False, "Invalid patient ID format"
+    # Wrong type or length is rejected with plain comparisons, before the
+    # cache lookup or a regex scan, so junk IDs never fill the cache
+    if not isinstance(oid, str) or len(oid) != 24:
+        return False, _OBJECT_ID_ERR
     
+    return _validate_object_id_hex(oid)
+
+
+@lru_cache(maxsize=4096)
+def _validate_object_id_hex(oid):
+    """
+    Check a 24-character string for hex digits only.
+    Results are memoized since the same IDs recur across requests.
+    """
+    if not OBJECT_ID_RE.fullmatch(oid):
+        return False, _OBJECT_ID_ERR
     return True, ""
 
 
@@ -130,9 +199,8 @@ def validate_gender(gender):
     Returns:
         tuple: (is_valid: bool, error_message: str)
     """
-    valid_genders = ["Male", "Female", "Other"]
-    if gender not in valid_genders:
-        return False, f"Gender must be one of: {', '.join(valid_genders)}"
+    if gender not in _GENDER_SET:
+        return False, _GENDER_ERR
     return True, ""
 
 
@@ -150,12 +218,14 @@ def validate_hypertension(hypertension):
         return False, "Hypertension value is required", None
     
     try:
-        value_int = int(hypertension)
-        if value_int not in [0, 1]:
-            return False, "Hypertension must be 0 (No) or 1 (Yes)", None
-        return True, "", value_int
+        value_int = int(hypertension, 10) if isinstance(hypertension, str) else int(hypertension)
     except (ValueError, TypeError):
-        return False, "Hypertension must be 0 (No) or 1 (Yes)", None
+        return False, _HYPERTENSION_ERR, None
+    
+    # Any bit other than the lowest set means the value is not 0 or 1
+    if value_int & ~1:
+        return False, _HYPERTENSION_ERR, None
+    return True, "", value_int
 
 
 def validate_ever_married(ever_married):
@@ -168,9 +238,8 @@ def validate_ever_married(ever_married):
     Returns:
         tuple: (is_valid: bool, error_message: str)
     """
-    valid_values = ["No", "Yes"]
-    if ever_married not in valid_values:
-        return False, f"Ever married must be one of: {', '.join(valid_values)}"
+    if ever_married not in _EVER_MARRIED_SET:
+        return False, _EVER_MARRIED_ERR
     return True, ""
 
 
@@ -184,9 +253,8 @@ def validate_work_type(work_type):
     Returns:
         tuple: (is_valid: bool, error_message: str)
     """
-    valid_types = ["Children", "Govt_job", "Never_worked", "Private", "Self-employed"]
-    if work_type not in valid_types:
-        return False, f"Work type must be one of: {', '.join(valid_types)}"
+    if work_type not in _WORK_TYPE_SET:
+        return False, _WORK_TYPE_ERR
     return True, ""
 
 
@@ -200,9 +268,8 @@ def validate_residence_type(residence_type):
     Returns:
         tuple: (is_valid: bool, error_message: str)
     """
-    valid_types = ["Rural", "Urban"]
-    if residence_type not in valid_types:
-        return False, f"Residence type must be one of: {', '.join(valid_types)}"
+    if residence_type not in _RESIDENCE_TYPE_SET:
+        return False, _RESIDENCE_TYPE_ERR
     return True, ""
 
 
@@ -216,18 +283,20 @@ def validate_avg_glucose_level(glucose_level):
     Returns:
         tuple: (is_valid: bool, error_message: str, value_float: float or None)
     """
-    if not glucose_level:
+    if glucose_level is None or glucose_level == "":
         return False, "Average glucose level is required", None
     
     try:
         value_float = float(glucose_level)
-        if value_float < 0:
-            return False, "Glucose level cannot be negative", None
-        if value_float > 500:
-            return False, "Glucose level must be a reasonable value (less than 500)", None
-        return True, "", value_float
     except (ValueError, TypeError):
         return False, "Glucose level must be a valid number", None
+    
+    # NaN fails the chained comparison too
+    if not 0.0 <= value_float <= 500.0:
+        if value_float < 0:
+            return False, "Glucose level cannot be negative", None
+        return False, "Glucose level must be a reasonable value (less than 500)", None
+    return True, "", value_float
 
 
 def validate_bmi(bmi):
@@ -240,18 +309,20 @@ def validate_bmi(bmi):
     Returns:
         tuple: (is_valid: bool, error_message: str, value_float: float or None)
     """
-    if not bmi:
+    if bmi is None or bmi == "":
         return False, "BMI is required", None
     
     try:
         value_float = float(bmi)
-        if value_float < 0:
-            return False, "BMI cannot be negative", None
-        if value_float > 100:
-            return False, "BMI must be a reasonable value (less than 100)", None
-        return True, "", value_float
     except (ValueError, TypeError):
         return False, "BMI must be a valid number", None
+    
+    # NaN fails the chained comparison too
+    if not 0.0 <= value_float <= 100.0:
+        if value_float < 0:
+            return False, "BMI cannot be negative", None
+        return False, "BMI must be a reasonable value (less than 100)", None
+    return True, "", value_float
 
 
 def validate_smoking_status(smoking_status):
@@ -264,8 +335,46 @@ def validate_smoking_status(smoking_status):
     Returns:
         tuple: (is_valid: bool, error_message: str)
     """
-    valid_statuses = ["Formerly smoked", "Never smoked", "Smokes", "Unknown"]
-    if smoking_status not in valid_statuses:
-        return False, f"Smoking status must be one of: {', '.join(valid_statuses)}"
+    if smoking_status not in _SMOKING_STATUS_SET:
+        return False, _SMOKING_STATUS_ERR
     return True, ""
 
+
+# Patient fields in validation order:
+# (key, validator, strip whitespace, validator returns a parsed value)
+_PATIENT_FIELDS = (
+    ("name", validate_patient_name, True, False),
+    ("age", validate_patient_age, True, True),
+    ("gender", validate_gender, False, False),
+    ("hypertension", validate_hypertension, False, True),
+    ("ever_married", validate_ever_married, False, False),
+    ("work_type", validate_work_type, False, False),
+    ("residence_type", validate_residence_type, False, False),
+    ("avg_glucose_level", validate_avg_glucose_level, True, True),
+    ("bmi", validate_bmi, True, True),
+    ("smoking_status", validate_smoking_status, False, False),
+)
+
+
+def validate_patient_payload(data):
+    """
+    Validate a complete patient record in one pass, stopping at the first error.
+    
+    Args:
+        data: Mapping of patient fields (e.g. request.form or a dict)
+        
+    Returns:
+        tuple: (is_valid: bool, error_message: str, patient_data: dict or None)
+            patient_data holds age and hypertension as int and glucose and
+            BMI as float, ready to store and to score without re-parsing
+    """
+    patient_data = {}
+    for key, validator, strip, has_value in _PATIENT_FIELDS:
+        value = data.get(key, "")
+        if strip and isinstance(value, str):
+            value = value.strip()
+        result = validator(value)
+        if not result[0]:
+            return False, result[1], None
+        patient_data[key] = result[2] if has_value else value
+    return True, "", patient_data
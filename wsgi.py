@@ -0,0 +1,17 @@
+"""
+WSGI entry point for production servers.
+
+Run with preforked Gunicorn workers, for example:
+    gunicorn -w $(nproc) -k gthread --threads 4 -b 0.0.0.0:8000 --preload wsgi:application
+
+--preload builds the app once in the master process so the loaded stroke
+model is shared copy-on-write by every worker.
+"""
+
+from app import create_app
+from utils.model_predictor import warm_predictor
+
+application = create_app()
+
+# Wait for the model here so it is loaded before Gunicorn forks the workers
+warm_predictor()